@@ -7,20 +7,34 @@ from urllib.parse import urlparse
 import requests
 from wallet import Wallet
 
+# Proof-of-work targets are 256-bit integers; a block is valid when int(hash) <= target.
+# MAX_TARGET is the easiest target allowed, INITIAL_TARGET matches the old 4-leading-zeros rule.
+MAX_TARGET = 2 ** 248 - 1
+INITIAL_TARGET = 2 ** 240 - 1
+# Retargeting and timestamp rules are consensus parameters and must be identical on every node.
+TARGET_BLOCK_TIME = 10
+RETARGET_WINDOW = 10
+MEDIAN_TIME_SPAN = 11
+MAX_FUTURE_DRIFT = 120
+
+def target_to_hex(target): return format(target, '064x')
+def block_work(target_hex): return 2 ** 256 // (int(target_hex, 16) + 1)
+
 class Block:
     """Represents a single block in our blockchain."""
-    def __init__(self, index, transactions, previous_hash, nonce=0, timestamp=None):
+    def __init__(self, index, transactions, previous_hash, nonce=0, timestamp=None, target=None):
         self.index = index
         self.timestamp = timestamp or time.time()
         self.transactions = transactions
         self.previous_hash = previous_hash
         self.nonce = nonce
+        self.target = target or target_to_hex(INITIAL_TARGET)
         self.hash = self.calculate_hash()
 
     def calculate_hash(self):
         block_data = {
             'index': self.index, 'timestamp': self.timestamp, 'transactions': self.transactions,
-            'previous_hash': self.previous_hash, 'nonce': self.nonce
+            'previous_hash': self.previous_hash, 'nonce': self.nonce, 'target': self.target
         }
         block_string = json.dumps(block_data, sort_keys=True).encode()
         return hashlib.sha256(block_string).hexdigest()
@@ -32,12 +46,13 @@ class Blockchain:
         self.pending_transactions = []
         self.nodes = set()
         self.mining_reward = 25
-        self.difficulty = 4 
+        self.total_work = 0
         self.genesis_block = self.create_genesis_block()
 
     def create_genesis_block(self):
         genesis_block = Block(index=0, transactions=[], previous_hash="0", nonce=0, timestamp=1751094000)
         self.chain.append(genesis_block)
+        self.total_work = block_work(genesis_block.target)
         return genesis_block
 
     def new_transaction(self, transaction, signature, public_key):
@@ -65,11 +80,14 @@ class Blockchain:
     def mine_new_block(self, miner_address):
         reward_transaction = {'type': 'reward', 'sender': "0", 'recipient': miner_address, 'amount': self.mining_reward}
         transactions_for_block = [reward_transaction] + self.pending_transactions
-        new_block_data = {'index': self.last_block.index + 1, 'timestamp': time.time(), 'transactions': transactions_for_block, 'previous_hash': self.last_block.hash}
+        target = self.next_target([(b.timestamp, b.target) for b in self.chain[1:]])
+        timestamp = max(time.time(), self.median_time_past([b.timestamp for b in self.chain]) + 0.001)
+        new_block_data = {'index': self.last_block.index + 1, 'timestamp': timestamp, 'transactions': transactions_for_block, 'previous_hash': self.last_block.hash, 'target': target}
         nonce = self.proof_of_work(new_block_data)
-        block = Block(index=new_block_data['index'], transactions=new_block_data['transactions'], previous_hash=new_block_data['previous_hash'], nonce=nonce, timestamp=new_block_data['timestamp'])
+        block = Block(index=new_block_data['index'], transactions=new_block_data['transactions'], previous_hash=new_block_data['previous_hash'], nonce=nonce, timestamp=new_block_data['timestamp'], target=target)
         self.pending_transactions = []
         self.chain.append(block)
+        self.total_work += block_work(target)
         return block
     
     def get_balance(self, address):
@@ -83,13 +101,32 @@ class Blockchain:
     # --- Other methods for consensus, etc. ---
     @property
     def last_block(self): return self.chain[-1]
+    def next_target(self, headers):
+        """
+        Retargets from the (timestamp, target) pairs of the chain's blocks, genesis excluded.
+        The mean target of the last RETARGET_WINDOW blocks is scaled by actual/expected time over
+        that window (clamped to 4x either way). Times are whole milliseconds so the result is exact.
+        """
+        window = headers[-(RETARGET_WINDOW + 1):]
+        if len(window) < 2: return target_to_hex(INITIAL_TARGET)
+        blocks = len(window) - 1
+        expected = TARGET_BLOCK_TIME * 1000 * blocks
+        actual = min(max(round((window[-1][0] - window[0][0]) * 1000), expected // 4), expected * 4)
+        mean_target = sum(int(target, 16) for _, target in window[1:]) // blocks
+        return target_to_hex(min(max(mean_target * actual // expected, 1), MAX_TARGET))
+    def median_time_past(self, timestamps):
+        recent = sorted(timestamps[-MEDIAN_TIME_SPAN:])
+        return recent[len(recent) // 2]
     def proof_of_work(self, block_data_to_mine):
+        target = int(block_data_to_mine['target'], 16)
         nonce = 0
         while True:
             block_data_to_mine['nonce'] = nonce
-            hash_result = hashlib.sha256(json.dumps(block_data_to_mine, sort_keys=True).encode()).hexdigest()
-            if hash_result.startswith('0' * self.difficulty): return nonce
+            if int.from_bytes(hashlib.sha256(json.dumps(block_data_to_mine, sort_keys=True).encode()).digest(), 'big') <= target: return nonce
             nonce += 1
+    def valid_proof(self, block_data, hash_result):
+        if hashlib.sha256(json.dumps(block_data, sort_keys=True).encode()).hexdigest() != hash_result: return False
+        return int(hash_result, 16) <= int(block_data['target'], 16)
     def resolve_did(self, did_string):
         for block in reversed(self.chain):
             for tx in block.transactions:
@@ -103,26 +140,37 @@ class Blockchain:
         return credentials
     def register_node(self, address): self.nodes.add(urlparse(address).netloc or urlparse(address).path)
     def valid_chain(self, chain_to_validate):
-        if not chain_to_validate or chain_to_validate[0]['hash'] != self.genesis_block.hash: return False
+        """Returns the cumulative work of a valid chain, or 0 if any block fails validation."""
+        if not chain_to_validate or chain_to_validate[0]['hash'] != self.genesis_block.hash: return 0
+        work = block_work(self.genesis_block.target); timestamps = [self.genesis_block.timestamp]; headers = []
         for i in range(1, len(chain_to_validate)):
             current_block_data = chain_to_validate[i]; previous_block_data = chain_to_validate[i - 1]
-            if current_block_data['previous_hash'] != previous_block_data['hash']: return False
-            temp_hash = current_block_data.pop('hash')
-            if not self.valid_proof(current_block_data, self.difficulty): current_block_data['hash'] = temp_hash; return False
-            current_block_data['hash'] = temp_hash
-        return True
+            if current_block_data['previous_hash'] != previous_block_data['hash']: return 0
+            # Timestamps drive retargeting: they must pass the median of recent blocks and not run ahead of our clock.
+            if current_block_data['timestamp'] <= self.median_time_past(timestamps): return 0
+            if current_block_data['timestamp'] > time.time() + MAX_FUTURE_DRIFT: return 0
+            if current_block_data.get('target') != self.next_target(headers): return 0
+            header = {k: current_block_data[k] for k in ['index', 'timestamp', 'transactions', 'previous_hash', 'nonce', 'target']}
+            if not self.valid_proof(header, current_block_data['hash']): return 0
+            timestamps.append(current_block_data['timestamp']); headers.append((current_block_data['timestamp'], current_block_data['target']))
+            work += block_work(current_block_data['target'])
+        return work
     def resolve_conflicts(self):
-        neighbours = self.nodes; new_chain = None; max_length = len(self.chain)
+        neighbours = self.nodes; new_chain = None; max_work = self.total_work
         for node in neighbours:
             try:
                 response = requests.get(f'http://{node}/chain')
                 if response.status_code == 200:
-                    length = response.json()['length']; chain_data = response.json()['chain']
-                    if length > max_length and self.valid_chain(chain_data):
-                        max_length = length
-                        self.chain = [Block(b['index'], b['transactions'], b['previous_hash'], b['nonce'], b['timestamp']) for b in chain_data]
-                        return True
+                    claimed_work = response.json().get('work', 0); chain_data = response.json()['chain']
+                    # The advertised work lets us skip validating chains that cannot win; the real work is recomputed.
+                    if claimed_work > max_work:
+                        work = self.valid_chain(chain_data)
+                        if work > max_work: max_work = work; new_chain = chain_data
             except requests.exceptions.ConnectionError: print(f"Could not connect to node {node}. Skipping.")
+        if new_chain:
+            self.chain = [Block(b['index'], b['transactions'], b['previous_hash'], b['nonce'], b['timestamp'], b['target']) for b in new_chain]
+            self.total_work = max_work
+            return True
         return False
 
 # --- API CODE ---
@@ -146,8 +194,21 @@ def new_transaction_endpoint():
     if success: response = {'message': f'Transaction will be added to Block {blockchain.last_block.index + 1}'}; return jsonify(response), 201
     else: response = {'message': 'Invalid transaction.'}; return jsonify(response), 400
 
+@app.route('/transactions/bulk', methods=['POST'])
+def bulk_transactions_endpoint():
+    values = request.get_json(force=True); payloads = values.get('transactions') if isinstance(values, dict) else None
+    if not isinstance(payloads, list): return 'Missing values', 400
+    results = []
+    for payload in payloads:
+        # One malformed element must not abort the batch after earlier elements were already queued.
+        well_formed = isinstance(payload, dict) and isinstance(payload.get('transaction'), dict) and isinstance(payload.get('signature'), str) and isinstance(payload.get('public_key'), str)
+        try: results.append(bool(well_formed and blockchain.new_transaction(payload['transaction'], payload['signature'], payload['public_key'])))
+        except (AttributeError, TypeError, ValueError): results.append(False)
+    response = {'message': f'{sum(results)} of {len(results)} transactions will be added to Block {blockchain.last_block.index + 1}', 'accepted': results}
+    return jsonify(response), 201
+
 @app.route('/chain', methods=['GET'])
-def full_chain(): response = {'chain': [block.__dict__ for block in blockchain.chain], 'length': len(blockchain.chain)}; return jsonify(response), 200
+def full_chain(): response = {'chain': [block.__dict__ for block in blockchain.chain], 'length': len(blockchain.chain), 'work': blockchain.total_work}; return jsonify(response), 200
 @app.route('/balance/<address>', methods=['GET'])
 def get_address_balance(address): response = {'address': address, 'balance': blockchain.get_balance(address)}; return jsonify(response), 200
 @app.route('/identity/resolve/<did_string>', methods=['GET'])
@@ -1,8 +1,36 @@
 # cli_wallet.py
-from wallet import Wallet
-import requests, json, os
+# Interactive menu when run without arguments; scriptable subcommands otherwise:
+#   python cli_wallet.py create
+#   python cli_wallet.py send WALLET.pem RECIPIENT AMOUNT
+#   python cli_wallet.py batch-send WALLET.pem payouts.csv   (rows: recipient,amount)
+#   python cli_wallet.py balance ADDRESS [ADDRESS ...]
+# The crypto stack (wallet.py / pycryptodome) is only imported by commands that sign.
+import requests, json, os, sys, csv, time, argparse, math
+from concurrent.futures import ThreadPoolExecutor
 
 BLOCKCHAIN_NODE_URL = "http://127.0.0.1:5000"
+HEADERS = {'Content-Type': 'application/json'}
+_session = None
+_wallet_cache = {}
+
+def get_session(pool_size=10):
+    """Returns one pooled HTTP session shared by every request this process makes."""
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        _session.mount('http://', adapter); _session.mount('https://', adapter)
+    return _session
+
+def load_wallet(wallet_file):
+    """Loads a PEM once per process; later calls for the same file reuse the Wallet."""
+    from wallet import Wallet
+    if wallet_file not in _wallet_cache: _wallet_cache[wallet_file] = Wallet.load_from_file(wallet_file)
+    return _wallet_cache[wallet_file]
+
+def build_transfer(sender_wallet, recipient_address, amount):
+    transaction_data = {"type": "transfer", "sender": sender_wallet.address, "recipient": recipient_address, "amount": amount}
+    return {"transaction": transaction_data, "signature": sender_wallet.sign(transaction_data), "public_key": sender_wallet.public_key}
 
 def print_menu():
     print("\n" + "="*30); print("      LockCore CLI Wallet"); print("="*30)
@@ -10,6 +38,7 @@ def print_menu():
     print("q. Quit"); print("="*30)
 
 def create_new_wallet():
+    from wallet import Wallet
     new_wallet = Wallet(); filename = new_wallet.save_to_file()
     print("\n✅ New wallet created successfully!"); print("="*55)
     print(f"Your new wallet address is: {new_wallet.address}")
@@ -24,12 +53,8 @@ def send_lck():
         if not os.path.exists(wallet_file): print("❌ ERROR: Wallet file not found."); return
         recipient_address = input("Enter the recipient's address: ")
         amount = float(input("Enter the amount of LCK to send: "))
-        sender_wallet = Wallet.load_from_file(wallet_file)
-        transaction_data = {"sender": sender_wallet.address, "recipient": recipient_address, "amount": amount}
-        signature = sender_wallet.sign(transaction_data)
-        api_payload = {"transaction": transaction_data, "signature": signature, "public_key": sender_wallet.public_key}
-        headers = {'Content-Type': 'application/json'}
-        response = requests.post(f"{BLOCKCHAIN_NODE_URL}/transactions/new", data=json.dumps(api_payload), headers=headers)
+        api_payload = build_transfer(load_wallet(wallet_file), recipient_address, amount)
+        response = get_session().post(f"{BLOCKCHAIN_NODE_URL}/transactions/new", data=json.dumps(api_payload), headers=HEADERS)
         if response.status_code == 201: print("\n✅ SUCCESS: Transaction submitted successfully!")
         else: print(f"\n❌ FAILED: {response.text}")
     except Exception as e: print(f"An unexpected error occurred: {e}")
@@ -47,14 +72,14 @@ def check_balance():
             print("❌ ERROR: Address cannot be empty.")
             return
 
-        response = requests.get(f"{BLOCKCHAIN_NODE_URL}/balance/{address}")
-        
+        response = get_session().get(f"{BLOCKCHAIN_NODE_URL}/balance/{address}")
+
         if response.status_code == 200:
             data = response.json()
             print(f"\n✅ Balance for address {data['address']} is: {data['balance']} LCK")
         else:
             print(f"\n❌ FAILED: Could not retrieve balance. Status: {response.status_code}")
-    
+
     except requests.exceptions.ConnectionError:
         print("❌ ERROR: Could not connect to the blockchain node. Is it running?")
     except Exception as e:
@@ -70,6 +95,124 @@ def main():
         elif choice == '3': check_balance() # Call the new function
         elif choice.lower() == 'q': print("Exiting wallet. Goodbye!"); break
         else: print("\nInvalid choice. Please try again.")
-    
+
+# ==============================================================================
+# Non-interactive commands
+# ==============================================================================
+def parse_amount(value):
+    amount = float(value)
+    if not math.isfinite(amount) or amount <= 0: raise ValueError(f"amount must be a positive number, got {value!r}")
+    return amount
+
+def read_payouts(csv_file):
+    """
+    Reads `recipient,amount` rows. Only the first row may be a header; blank lines are skipped.
+    Any other malformed row raises ValueError naming its line number.
+    """
+    payouts = []
+    with open(csv_file, newline='') as f:
+        for line_number, row in enumerate(csv.reader(f), start=1):
+            if not any(cell.strip() for cell in row): continue
+            try:
+                if len(row) != 2 or not row[0].strip(): raise ValueError("expected a recipient and an amount")
+                payouts.append((row[0].strip(), parse_amount(row[1])))
+            except ValueError as e:
+                if line_number == 1: continue
+                raise ValueError(f"{csv_file} line {line_number}: {e}")
+    return payouts
+
+def submit_transfers(payloads, concurrency, use_bulk=True):
+    """
+    Submits signed payloads via /transactions/bulk, or as concurrent single posts when `use_bulk` is False
+    or the node has no bulk route. Returns (accepted flags, whether the bulk route is available).
+    """
+    session = get_session(concurrency)
+    if use_bulk:
+        response = session.post(f"{BLOCKCHAIN_NODE_URL}/transactions/bulk", data=json.dumps({'transactions': payloads}), headers=HEADERS)
+        if response.status_code == 201: return response.json()['accepted'], True
+        if response.status_code not in (404, 405): raise RuntimeError(f"Bulk submission failed: {response.text}")
+
+    def post_one(api_payload):
+        return session.post(f"{BLOCKCHAIN_NODE_URL}/transactions/new", data=json.dumps(api_payload), headers=HEADERS).status_code == 201
+    with ThreadPoolExecutor(max_workers=concurrency) as pool: return list(pool.map(post_one, payloads)), False
+
+def cmd_create(args):
+    from wallet import Wallet
+    new_wallet = Wallet(); filename = new_wallet.save_to_file(args.directory)
+    print(f"{new_wallet.address} {filename}")
+
+def cmd_send(args):
+    if not os.path.exists(args.wallet_file): print("❌ ERROR: Wallet file not found."); return 1
+    return cmd_batch(args, [(args.recipient, parse_amount(args.amount))])
+
+def cmd_batch_send(args):
+    if not os.path.exists(args.wallet_file): print("❌ ERROR: Wallet file not found."); return 1
+    if not os.path.exists(args.csv_file): print("❌ ERROR: Payout CSV file not found."); return 1
+    return cmd_batch(args, read_payouts(args.csv_file))
+
+def cmd_batch(args, payouts):
+    start = time.perf_counter()
+    sender_wallet = load_wallet(args.wallet_file)
+    payloads = [build_transfer(sender_wallet, recipient, amount) for recipient, amount in payouts]
+    signed = time.perf_counter()
+    print(f"Signed {len(payloads)} transactions in {signed - start:.2f}s")
+    accepted = []; use_bulk = True
+    for offset in range(0, len(payloads), args.batch_size):
+        chunk = payloads[offset:offset + args.batch_size]
+        chunk_start = time.perf_counter()
+        chunk_accepted, use_bulk = submit_transfers(chunk, args.concurrency, use_bulk)
+        elapsed = time.perf_counter() - chunk_start
+        accepted += chunk_accepted
+        print(f"   batch {offset // args.batch_size + 1}: {sum(chunk_accepted)} of {len(chunk)} accepted in {elapsed:.2f}s "
+              f"({len(chunk) / elapsed if elapsed else 0:.1f} tx/s)")
+    done = time.perf_counter()
+    for (recipient, amount), ok in zip(payouts, accepted):
+        if not ok: print(f"❌ FAILED: {amount} LCK to {recipient}")
+    print(f"✅ {sum(accepted)} of {len(payloads)} transactions accepted "
+          f"({len(payloads) / (done - start) if done > start else 0:.1f} tx/s overall)")
+    return 0 if all(accepted) else 1
+
+def cmd_balance(args):
+    session = get_session(args.concurrency)
+    def fetch(address): return session.get(f"{BLOCKCHAIN_NODE_URL}/balance/{address}")
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool: responses = list(pool.map(fetch, args.addresses))
+    elapsed = time.perf_counter() - start
+    for address, response in zip(args.addresses, responses):
+        if response.status_code == 200: print(f"{address} {response.json()['balance']}")
+        else: print(f"{address} ERROR {response.status_code}")
+    if len(args.addresses) > 1: print(f"{len(args.addresses)} balances in {elapsed:.2f}s")
+    return 0 if all(r.status_code == 200 for r in responses) else 1
+
+def run_command(argv):
+    global BLOCKCHAIN_NODE_URL
+    parser = argparse.ArgumentParser(prog='cli_wallet.py', description="LockCore CLI Wallet")
+    parser.add_argument('--node', default=BLOCKCHAIN_NODE_URL, help='URL of the blockchain node')
+    parser.add_argument('-c', '--concurrency', default=10, type=int, help='parallel HTTP requests')
+    parser.add_argument('-b', '--batch-size', default=100, type=int, help='transactions per submitted batch')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    create = subparsers.add_parser('create', help='create a new wallet')
+    create.add_argument('--directory', default='wallets', help='where to save the .pem file')
+    create.set_defaults(func=cmd_create)
+    send = subparsers.add_parser('send', help='send LCK to one recipient')
+    send.add_argument('wallet_file'); send.add_argument('recipient'); send.add_argument('amount', type=float)
+    send.set_defaults(func=cmd_send)
+    batch = subparsers.add_parser('batch-send', help='send LCK to every recipient,amount row of a CSV file')
+    batch.add_argument('wallet_file'); batch.add_argument('csv_file')
+    batch.set_defaults(func=cmd_batch_send)
+    balance = subparsers.add_parser('balance', help='print the balance of one or more addresses')
+    balance.add_argument('addresses', nargs='+')
+    balance.set_defaults(func=cmd_balance)
+    args = parser.parse_args(argv)
+    if args.concurrency < 1: parser.error("--concurrency must be at least 1")
+    if args.batch_size < 1: parser.error("--batch-size must be at least 1")
+    BLOCKCHAIN_NODE_URL = args.node.rstrip('/')
+    try: return args.func(args) or 0
+    except requests.exceptions.ConnectionError:
+        print("❌ ERROR: Could not connect to the blockchain node. Is it running?"); return 1
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"❌ ERROR: {e}"); return 1
+
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    if len(sys.argv) > 1: sys.exit(run_command(sys.argv[1:]))
+    main()
@@ -0,0 +1,282 @@
+# cluster_harness.py
+# Launches a local LockCore cluster, drives transaction load against it and
+# measures how the /nodes/register + /nodes/resolve consensus path behaves.
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from wallet import Wallet
+
+HOST = "127.0.0.1"
+NODE_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "blockchain.py")
+
+
+# ==============================================================================
+# Node lifecycle
+# ==============================================================================
+
+class LocalNode:
+    """A blockchain.py process listening on a local port."""
+    def __init__(self, port, log_dir=None):
+        self.port = port
+        self.url = f"http://{HOST}:{port}"
+        self.address = f"{HOST}:{port}"
+        self.log = open(os.path.join(log_dir, f"node-{port}.log"), 'wt') if log_dir else None
+        self.process = subprocess.Popen([sys.executable, NODE_SCRIPT, '-p', str(port)], stdout=self.log or subprocess.DEVNULL, stderr=subprocess.STDOUT)
+
+    def wait_until_ready(self, timeout=15):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if self.process.poll() is not None: raise RuntimeError(f"Node on port {self.port} exited early.")
+            try:
+                if requests.get(f"{self.url}/chain", timeout=1).ok: return
+            except requests.exceptions.ConnectionError: pass
+            time.sleep(0.1)
+        raise RuntimeError(f"Node on port {self.port} did not start within {timeout}s.")
+
+    def chain(self):
+        return requests.get(f"{self.url}/chain").json()['chain']
+
+    def tip(self):
+        return self.chain()[-1]['hash']
+
+    def work(self):
+        return requests.get(f"{self.url}/chain").json()['work']
+
+    def mine(self, miner_address=None):
+        params = {'miner_address': miner_address} if miner_address else None
+        return requests.get(f"{self.url}/mine", params=params).json()['block']
+
+    def resolve(self, timeout=None):
+        return requests.get(f"{self.url}/nodes/resolve", timeout=timeout).json()
+
+    def register(self, addresses):
+        return requests.post(f"{self.url}/nodes/register", data=json.dumps({'nodes': addresses}),
+                             headers={'Content-Type': 'application/json'})
+
+    def stop(self):
+        if self.process.poll() is None:
+            self.process.terminate()
+            try: self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired: self.process.kill()
+        if self.log: self.log.close(); self.log = None
+
+
+class SlowPeer:
+    """A proxy in front of a real node that answers every request after a fixed delay."""
+    def __init__(self, port, upstream_url, delay):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                time.sleep(delay)
+                upstream = requests.get(f"{upstream_url}{self.path}")
+                self.send_response(upstream.status_code)
+                self.send_header('Content-Type', upstream.headers.get('Content-Type', 'application/json'))
+                self.end_headers()
+                self.wfile.write(upstream.content)
+
+            def log_message(self, *args): pass
+
+        self.address = f"{HOST}:{port}"
+        self.server = ThreadingHTTPServer((HOST, port), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.server.shutdown(); self.server.server_close()
+
+
+def start_cluster(size, base_port, log_dir=None):
+    nodes = [LocalNode(base_port + i, log_dir) for i in range(size)]
+    try:
+        for node in nodes: node.wait_until_ready()
+    except RuntimeError:
+        for node in nodes: node.stop()
+        raise
+    return nodes
+
+
+def wire_cluster(nodes, extra_peers=()):
+    """Registers every node with every other node, plus any extra (slow/dead) peers."""
+    for node in nodes:
+        peers = [f"http://{other.address}" for other in nodes if other is not node]
+        peers += [f"http://{address}" for address in extra_peers]
+        node.register(peers)
+
+
+# ==============================================================================
+# Load generation
+# ==============================================================================
+
+def build_transfers(wallets, count):
+    """Signs `count` transfers cycling through the generated wallets."""
+    payloads = []
+    for i in range(count):
+        sender = wallets[i % len(wallets)]; recipient = wallets[(i + 1) % len(wallets)]
+        transaction_data = {"type": "transfer", "sender": sender.address, "recipient": recipient.address, "amount": 1}
+        payloads.append({"transaction": transaction_data, "signature": sender.sign(transaction_data), "public_key": sender.public_key})
+    return payloads
+
+
+def drive_load(nodes, payloads, concurrency):
+    """Posts the signed payloads round-robin across the cluster. Returns (accepted, rejected, seconds)."""
+    local = threading.local()
+    headers = {'Content-Type': 'application/json'}
+
+    def submit(item):
+        index, payload = item
+        if not hasattr(local, 'session'): local.session = requests.Session()
+        node = nodes[index % len(nodes)]
+        try: return local.session.post(f"{node.url}/transactions/new", data=json.dumps(payload), headers=headers).status_code == 201
+        except requests.exceptions.RequestException: return False
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(submit, enumerate(payloads)))
+    elapsed = time.perf_counter() - start
+    accepted = sum(results)
+    return accepted, len(results) - accepted, elapsed
+
+
+# ==============================================================================
+# Measurements
+# ==============================================================================
+
+def reorg_depth(old_chain, new_chain):
+    """Number of blocks from `old_chain` that were dropped when switching to `new_chain`."""
+    common = 0
+    for old_block, new_block in zip(old_chain, new_chain):
+        if old_block['hash'] != new_block['hash']: break
+        common += 1
+    return len(old_chain) - common
+
+
+def sync_node(node, target_tip, timeout, resolve_timeout=None, backoff=0.05, max_backoff=1.0):
+    """
+    Calls /nodes/resolve on one node until it reports `target_tip`, backing off between attempts.
+    Returns (latency in seconds or None if it never converged, reorg depth).
+    """
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        try:
+            old_chain = node.chain()
+            if old_chain[-1]['hash'] == target_tip: return time.perf_counter() - start, 0
+            node.resolve(timeout=resolve_timeout)
+            new_chain = node.chain()
+            if new_chain[-1]['hash'] == target_tip: return time.perf_counter() - start, reorg_depth(old_chain, new_chain)
+        except (requests.exceptions.RequestException, KeyError, IndexError): pass
+        time.sleep(backoff); backoff = min(backoff * 2, max_backoff)
+    return None, 0
+
+
+def resolve_cluster(nodes, target_tip, timeout, resolve_timeout=None):
+    """
+    Syncs every node to `target_tip` in parallel, timing each node on its own.
+    Returns (per-node latency in seconds, convergence time, max reorg depth).
+    Nodes that never converge get a latency of None.
+    """
+    with ThreadPoolExecutor(max_workers=len(nodes)) as pool:
+        results = list(pool.map(lambda node: sync_node(node, target_tip, timeout, resolve_timeout), nodes))
+    latencies = {node.port: latency for node, (latency, _) in zip(nodes, results)}
+    depth = max(depth for _, depth in results)
+    converged = [latency for latency in latencies.values() if latency is not None]
+    convergence = max(converged) if len(converged) == len(nodes) else None
+    return latencies, convergence, depth
+
+
+def inject_fork(nodes, first_branch, second_branch):
+    """
+    Mines two competing branches on nodes[0] and nodes[1].
+    Returns the tip of the branch with more cumulative work, or None if both carry the same work.
+    """
+    for _ in range(first_branch): nodes[0].mine()
+    for _ in range(second_branch): nodes[1].mine()
+    first_work, second_work = nodes[0].work(), nodes[1].work()
+    if first_work == second_work: return None
+    return nodes[0].tip() if first_work > second_work else nodes[1].tip()
+
+
+def print_round(title, latencies, convergence, depth):
+    print(f"\n--- {title} ---")
+    for port, latency in latencies.items():
+        print(f"  node :{port:<6} {'did not converge' if latency is None else f'{latency * 1000:.1f} ms'}")
+    print(f"  convergence time: {'n/a' if convergence is None else f'{convergence * 1000:.1f} ms'}")
+    print(f"  reorg depth:      {depth}")
+
+
+# ==============================================================================
+# Entry point
+# ==============================================================================
+
+def fork_spec(value):
+    """Parses --fork A:B into a tuple of two positive block counts."""
+    try: first_branch, second_branch = (int(part) for part in value.split(':'))
+    except ValueError: raise argparse.ArgumentTypeError(f"expected A:B with two block counts, got {value!r}")
+    if min(first_branch, second_branch) < 1: raise argparse.ArgumentTypeError("fork branches must have at least one block")
+    return first_branch, second_branch
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local LockCore cluster and measure sync behaviour.")
+    parser.add_argument('-n', '--nodes', default=3, type=int, help='number of nodes to launch (at least 2)')
+    parser.add_argument('--base-port', default=5100, type=int, help='port of the first node')
+    parser.add_argument('--wallets', default=10, type=int, help='number of generated wallets')
+    parser.add_argument('--transactions', default=200, type=int, help='number of transfers to submit')
+    parser.add_argument('--concurrency', default=8, type=int, help='concurrent submitters')
+    parser.add_argument('--rounds', default=3, type=int, help='mine-and-propagate rounds')
+    parser.add_argument('--fork', default=None, type=fork_spec, metavar='A:B', help='inject a fork with branches of A and B blocks; the branch with more work should win')
+    parser.add_argument('--slow-peers', default=0, type=int, help='number of slow peers registered with every node')
+    parser.add_argument('--slow-delay', default=2.0, type=float, help='response delay of a slow peer in seconds')
+    parser.add_argument('--dead-peers', default=0, type=int, help='number of unreachable peers registered with every node')
+    parser.add_argument('--timeout', default=60.0, type=float, help='give up on convergence after this many seconds')
+    parser.add_argument('--resolve-timeout', default=10.0, type=float, help='seconds before a single /nodes/resolve call is abandoned and retried')
+    parser.add_argument('--log-dir', default=None, type=str, help='write node output to this directory')
+    args = parser.parse_args()
+    if args.nodes < 2: parser.error("--nodes must be at least 2")
+
+    if args.log_dir: os.makedirs(args.log_dir, exist_ok=True)
+    print(f"Starting {args.nodes} nodes from port {args.base_port}...")
+    nodes = start_cluster(args.nodes, args.base_port, args.log_dir)
+    slow_peers = []
+    try:
+        next_port = args.base_port + args.nodes
+        for i in range(args.slow_peers):
+            slow_peers.append(SlowPeer(next_port, nodes[i % len(nodes)].url, args.slow_delay)); next_port += 1
+        dead_peers = [f"{HOST}:{next_port + i}" for i in range(args.dead_peers)]
+        wire_cluster(nodes, [peer.address for peer in slow_peers] + dead_peers)
+        print(f"✅ Cluster wired: {len(nodes)} nodes, {len(slow_peers)} slow peers, {len(dead_peers)} dead peers")
+
+        wallets = [Wallet() for _ in range(args.wallets)]
+        payloads = build_transfers(wallets, args.transactions)
+        accepted, rejected, elapsed = drive_load(nodes, payloads, args.concurrency)
+        print("\n--- Load ---")
+        print(f"  submitted {len(payloads)} transfers in {elapsed:.2f}s: {accepted} accepted, {rejected} rejected")
+        print(f"  throughput: {accepted / elapsed if elapsed else 0:.1f} tx/s")
+
+        for round_number in range(1, args.rounds + 1):
+            miner = nodes[(round_number - 1) % len(nodes)]
+            block = miner.mine(wallets[round_number % len(wallets)].address)
+            latencies, convergence, depth = resolve_cluster(nodes, block['hash'], args.timeout, args.resolve_timeout)
+            print_round(f"Round {round_number}: block {block['index']} mined on :{miner.port}", latencies, convergence, depth)
+
+        if args.fork:
+            first_branch, second_branch = args.fork
+            tip = inject_fork(nodes, first_branch, second_branch)
+            title = f"Fork {first_branch}:{second_branch} between :{nodes[0].port} and :{nodes[1].port}"
+            if tip is None: print(f"\n--- {title} ---\n  both branches carry equal work; no chain is expected to win")
+            else:
+                latencies, convergence, depth = resolve_cluster(nodes, tip, args.timeout, args.resolve_timeout)
+                print_round(title, latencies, convergence, depth)
+    finally:
+        for peer in slow_peers: peer.stop()
+        for node in nodes: node.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+# test_batch_send.py
+# Offline checks of cli_wallet batch-send parsing and submission, and of the node's /transactions/bulk route.
+# Run with `python -m pytest test_batch_send.py` or `python test_batch_send.py`.
+
+import math
+import os
+import tempfile
+from unittest import mock
+import cli_wallet
+import blockchain
+from wallet import Wallet
+
+def write_csv(text):
+    f = tempfile.NamedTemporaryFile('wt', suffix='.csv', delete=False); f.write(text); f.close()
+    return f.name
+
+def expect_error(function, *args, contains=''):
+    try: function(*args)
+    except ValueError as e: assert contains in str(e), str(e); return
+    raise AssertionError(f"{function.__name__}{args} did not raise ValueError")
+
+def test_parse_amount_rejects_non_positive_and_non_finite():
+    assert cli_wallet.parse_amount('2.5') == 2.5
+    for value in ['0', '-5', 'inf', 'nan', 'abc']: expect_error(cli_wallet.parse_amount, value)
+    assert math.isfinite(cli_wallet.parse_amount('1e3'))
+
+def test_read_payouts_skips_only_a_header_and_blank_lines():
+    csv_file = write_csv("recipient,amount\nabc,1\n\ndef,2.5\n")
+    try: assert cli_wallet.read_payouts(csv_file) == [('abc', 1.0), ('def', 2.5)]
+    finally: os.remove(csv_file)
+    csv_file = write_csv("abc,1\n")
+    try: assert cli_wallet.read_payouts(csv_file) == [('abc', 1.0)]
+    finally: os.remove(csv_file)
+
+def test_read_payouts_reports_bad_rows_by_line_number():
+    for text, line in [("recipient,amount\nabc,notanumber\ndef,2\n", 2), ("abc,1\n,3\n", 2),
+                       ("abc,1\ndef,2\nghi,-5\n", 3), ("abc,1\n\ndef,inf\n", 3), ("abc,1\ndef\n", 2)]:
+        csv_file = write_csv(text)
+        try: expect_error(cli_wallet.read_payouts, csv_file, contains=f"line {line}:")
+        finally: os.remove(csv_file)
+
+def fake_session(bulk_status):
+    """A session whose bulk route answers `bulk_status` and whose single route accepts every transaction."""
+    def post(url, **kwargs):
+        if url.endswith('/transactions/bulk'): return mock.Mock(status_code=bulk_status, text='error', json=lambda: {'accepted': [True, False]})
+        return mock.Mock(status_code=201)
+    return mock.Mock(post=mock.Mock(side_effect=post))
+
+def test_submit_transfers_uses_bulk_route_when_present():
+    session = fake_session(201)
+    with mock.patch('cli_wallet.get_session', return_value=session):
+        assert cli_wallet.submit_transfers([{}, {}], concurrency=2) == ([True, False], True)
+    assert session.post.call_count == 1
+
+def test_submit_transfers_falls_back_to_single_posts():
+    for status in (404, 405):
+        session = fake_session(status)
+        with mock.patch('cli_wallet.get_session', return_value=session):
+            assert cli_wallet.submit_transfers([{}, {}, {}], concurrency=2) == ([True, True, True], False)
+            assert cli_wallet.submit_transfers([{}], concurrency=2, use_bulk=False) == ([True], False)
+        assert session.post.call_count == 1 + 3 + 1
+
+def test_submit_transfers_raises_on_bulk_failure():
+    with mock.patch('cli_wallet.get_session', return_value=fake_session(500)):
+        try: cli_wallet.submit_transfers([{}], concurrency=1)
+        except RuntimeError: return
+    raise AssertionError("a failed bulk submission did not raise")
+
+def test_bulk_route_rejects_malformed_elements_individually():
+    sender = Wallet(); transaction = {"type": "transfer", "sender": sender.address, "recipient": "someone", "amount": 1}
+    valid = {"transaction": transaction, "signature": sender.sign(transaction), "public_key": sender.public_key}
+    client = blockchain.app.test_client(); pending = len(blockchain.blockchain.pending_transactions)
+    payloads = [valid, "abc", {"transaction": "x", "signature": "00", "public_key": sender.public_key},
+                {"transaction": transaction, "signature": valid['signature'], "public_key": 5}, valid]
+    response = client.post('/transactions/bulk', json={'transactions': payloads})
+    assert response.status_code == 201
+    assert response.get_json()['accepted'] == [True, False, False, False, True]
+    assert len(blockchain.blockchain.pending_transactions) == pending + 2
+    assert client.post('/transactions/bulk', json=[valid]).status_code == 400
+
+if __name__ == '__main__':
+    test_parse_amount_rejects_non_positive_and_non_finite()
+    test_read_payouts_skips_only_a_header_and_blank_lines()
+    test_read_payouts_reports_bad_rows_by_line_number()
+    test_submit_transfers_uses_bulk_route_when_present()
+    test_submit_transfers_falls_back_to_single_posts()
+    test_submit_transfers_raises_on_bulk_failure()
+    test_bulk_route_rejects_malformed_elements_individually()
+    print("✅ All batch-send tests passed.")
@@ -0,0 +1,88 @@
+# test_difficulty.py
+# Offline checks of difficulty retargeting, timestamp rules and work-based fork choice (no running node needed).
+# Run with `python -m pytest test_difficulty.py` or `python test_difficulty.py`.
+
+import random
+import time
+from unittest import mock
+from blockchain import Blockchain, Block, block_work, INITIAL_TARGET, TARGET_BLOCK_TIME, MAX_FUTURE_DRIFT
+
+def simulate(blocks, base_block_time, randomize=False):
+    """Mines `blocks` simulated blocks at a constant hashrate that gives `base_block_time` seconds at INITIAL_TARGET."""
+    blockchain = Blockchain(); rng = random.Random(1)
+    headers = []; now = 1000.0; block_times = []
+    for _ in range(blocks):
+        target = blockchain.next_target(headers)
+        block_time = base_block_time * INITIAL_TARGET / int(target, 16)
+        if randomize: block_time = rng.expovariate(1 / block_time)
+        now += block_time; headers.append((now, target)); block_times.append(block_time)
+    return block_times
+
+def test_next_target_converges_for_constant_hashrate():
+    block_times = simulate(200, base_block_time=2)
+    for block_time in block_times[-50:]:
+        assert abs(block_time - TARGET_BLOCK_TIME) < 0.1
+
+def test_next_target_averages_target_block_time_with_random_block_times():
+    block_times = simulate(600, base_block_time=2, randomize=True)[100:]
+    assert abs(sum(block_times) / len(block_times) - TARGET_BLOCK_TIME) < 1
+
+def mine_with_timestamp(blockchain, timestamp):
+    """Mines a block on top of `blockchain` with a forged timestamp and returns the chain as /chain would serve it."""
+    target = blockchain.next_target([(b.timestamp, b.target) for b in blockchain.chain[1:]])
+    block_data = {'index': blockchain.last_block.index + 1, 'timestamp': timestamp, 'transactions': [], 'previous_hash': blockchain.last_block.hash, 'target': target}
+    nonce = blockchain.proof_of_work(block_data)
+    block = Block(block_data['index'], [], block_data['previous_hash'], nonce, timestamp, target)
+    return [dict(b.__dict__) for b in blockchain.chain + [block]]
+
+def test_valid_chain_checks_timestamps():
+    blockchain = Blockchain(); blockchain.mine_new_block('miner')
+    assert blockchain.valid_chain([dict(b.__dict__) for b in blockchain.chain]) == blockchain.total_work
+    assert blockchain.valid_chain(mine_with_timestamp(blockchain, time.time() + MAX_FUTURE_DRIFT * 2)) == 0
+    assert blockchain.valid_chain(mine_with_timestamp(blockchain, blockchain.genesis_block.timestamp)) == 0
+
+def extend(blockchain, timestamps):
+    """Mines one empty block per timestamp onto `blockchain`, retargeting as a node would."""
+    for timestamp in timestamps:
+        chain_data = mine_with_timestamp(blockchain, timestamp)[-1]
+        blockchain.chain.append(Block(chain_data['index'], [], chain_data['previous_hash'], chain_data['nonce'], timestamp, chain_data['target']))
+        blockchain.total_work += block_work(chain_data['target'])
+    return blockchain
+
+def serve_chain(blockchain, advertised_work=None):
+    """Stubs requests.get so resolve_conflicts sees `blockchain` as its only neighbour."""
+    response = mock.Mock(status_code=200)
+    response.json.return_value = {'chain': [dict(b.__dict__) for b in blockchain.chain], 'length': len(blockchain.chain),
+                                  'work': blockchain.total_work if advertised_work is None else advertised_work}
+    return mock.patch('blockchain.requests.get', return_value=response)
+
+def light_and_heavy_chains():
+    """A longer chain of slow (easy) blocks and a shorter chain whose fast blocks retarget to a harder third block."""
+    start = time.time() - 1000
+    light = extend(Blockchain(), [start, start + 100, start + 200, start + 300])
+    heavy = extend(Blockchain(), [start, start + 0.001, start + 0.002])
+    assert len(light.chain) > len(heavy.chain) and light.total_work < heavy.total_work
+    return light, heavy
+
+def test_resolve_conflicts_prefers_more_work_over_more_blocks():
+    light, heavy = light_and_heavy_chains()
+    light.register_node('http://neighbour:5000')
+    with serve_chain(heavy): assert light.resolve_conflicts()
+    assert [b.hash for b in light.chain] == [b.hash for b in heavy.chain]
+    assert light.total_work == heavy.total_work
+
+def test_resolve_conflicts_recomputes_advertised_work():
+    light, heavy = light_and_heavy_chains()
+    heavy.register_node('http://neighbour:5000')
+    original_hashes = [b.hash for b in heavy.chain]
+    assert heavy.valid_chain([dict(b.__dict__) for b in light.chain]) == light.total_work
+    with serve_chain(light, advertised_work=heavy.total_work * 100): assert not heavy.resolve_conflicts()
+    assert [b.hash for b in heavy.chain] == original_hashes
+
+if __name__ == '__main__':
+    test_next_target_converges_for_constant_hashrate()
+    test_next_target_averages_target_block_time_with_random_block_times()
+    test_valid_chain_checks_timestamps()
+    test_resolve_conflicts_prefers_more_work_over_more_blocks()
+    test_resolve_conflicts_recomputes_advertised_work()
+    print("✅ All difficulty tests passed.")